@@ -1,11 +1,13 @@
 import os
 import asyncio
+import hashlib
 import logging
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from decimal import Decimal
 from typing import Dict, Optional, List, Union
 import aiohttp
-from aiogram import Bot, Dispatcher, types, F
+from aiogram import Bot, Dispatcher, Router, types, F
 from aiogram.filters import Command
 from aiogram.enums import ChatType  # This is the correct import
 from aiogram.types import (
@@ -17,21 +19,31 @@ from aiogram.types import (
     Chat
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder
-from aiogram.exceptions import TelegramAPIError
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramNetworkError,
+    TelegramRetryAfter
+)
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
 from dotenv import load_dotenv
 from database import (
-    init_db, 
-    get_session, 
-    Token, 
-    Group, 
-    Boost, 
+    init_db,
+    get_session,
+    Token,
+    Group,
+    Boost,
     GroupConfig,
-    TokenStats
+    flush_buy_events
 )
 from sui_api import SuiAPI, TokenData, BuyData
 from config import Config, ConfigState
+from utils import TTLCache, close_session as close_utils_session
 import json
+import ujson
 import re
 from decimal import ROUND_DOWN
 import traceback
@@ -56,36 +68,157 @@ PORT = int(os.environ.get("PORT", 8080))
 DEFAULT_BUY_STEP = 5
 DEFAULT_MIN_BUY = 1
 MAX_EMOJIS = 50
+TOKEN_ADDRESS_RE = re.compile(r'^0x[a-fA-F0-9]{64}$', re.ASCII)
 
-# Initialize bot and dispatcher
+# Initialize bot and dispatcher. Each conversational flow gets its own
+# router so the dispatcher only walks the handlers of the flow an update
+# belongs to instead of every registered handler.
 bot = Bot(token=BOT_TOKEN, parse_mode="HTML")
 dp = Dispatcher()
+config_router = Router(name="config")
+boost_router = Router(name="boost")
 
 # State storage
 config_sessions: Dict[int, Config] = {}
 boost_sessions: Dict[int, dict] = {}
 active_groups: Dict[int, GroupConfig] = {}
-token_cache: Dict[str, TokenData] = {}
 pending_boosts: Dict[str, dict] = {}
 
-# Boost pricing and durations
-BOOST_OPTIONS = {
-    "4h": {"duration": 4, "price": 15, "display": "4 Hours - 15 SUI"},
-    "8h": {"duration": 8, "price": 20, "display": "8 Hours - 20 SUI"},
-    "12h": {"duration": 12, "price": 27, "display": "12 Hours - 27 SUI"},
-    "24h": {"duration": 24, "price": 45, "display": "24 Hours - 45 SUI"},
-    "48h": {"duration": 48, "price": 80, "display": "48 Hours - 80 SUI"},
-    "72h": {"duration": 72, "price": 110, "display": "72 Hours - 110 SUI"},
-    "1w": {"duration": 168, "price": 180, "display": "1 Week - 180 SUI"}
+# Bounded token-data cache: entries age out after an hour and the oldest
+# are evicted at capacity, instead of the old dict that grew without
+# limit and was mutated in place
+token_cache: TTLCache = TTLCache(maxsize=5000, ttl=3600)
+
+# In-memory GroupConfig index: token_address -> configs tracking that token.
+# Loaded on startup and refreshed on config saves, so buy events resolve
+# their groups with a dict lookup instead of a SELECT per event.
+config_cache: Dict[str, List[GroupConfig]] = {}
+config_cache_lock = asyncio.Lock()
+
+# Write batching: per-buy commits are coalesced here and flushed in a
+# single transaction by flush_pending_writes() every FLUSH_INTERVAL
+# seconds. Events are stored as column dicts so the flush can use the
+# executemany insert fast path.
+pending_buy_events: List[dict] = []
+pending_stats: Dict[str, dict] = {}
+pending_writes_lock = asyncio.Lock()
+FLUSH_INTERVAL = 2  # seconds
+
+# Outbound alert queue: handlers enqueue (chat_id, message, keyboard) and
+# alert_worker() drains it, pacing sends to stay under the Telegram
+# bot-wide 30 msg/s limit instead of awaiting each send inline.
+alert_queue: asyncio.Queue = asyncio.Queue(maxsize=1000)
+MAX_SENDS_PER_SECOND = 30
+MAX_SEND_RETRIES = 5
+
+# Buy-button keyboards are deterministic per token, so build each once
+# and reuse it for every alert instead of rebuilding per buy
+buy_keyboard_cache: Dict[str, InlineKeyboardMarkup] = {}
+
+# Float copies of each config's min_buy/buy_step thresholds. Decimal
+# arithmetic is far slower than float math and threshold comparisons and
+# emoji counts don't need exact precision; Decimal stays on the
+# persistence boundary. Entries are dropped on config refresh.
+config_float_cache: Dict[tuple, tuple] = {}
+
+def config_thresholds(config) -> tuple:
+    """Return (min_buy, buy_step) for a config as cached floats"""
+    key = (config.group_id, config.token_address)
+    cached = config_float_cache.get(key)
+    if cached is None:
+        cached = (float(config.min_buy), float(config.buy_step))
+        config_float_cache[key] = cached
+    return cached
+
+# All 51 possible emoji lines (newlines included) keyed by emoji:
+# alerts index a prebuilt tuple instead of multiplying, slicing and
+# re-wrapping strings per buy
+emoji_line_cache: Dict[str, tuple] = {}
+
+# Static alert tail (social links + footer) keyed by token and links, so
+# per-buy formatting only renders the dynamic fields. Keys embed the
+# link values, so config changes naturally miss to a fresh entry.
+alert_footer_cache: Dict[tuple, str] = {}
+
+# Columns the alert path actually reads; used with load_only so cached
+# GroupConfig rows skip hydrating audit/timestamp columns
+GROUP_CONFIG_COLUMNS = (
+    GroupConfig.group_id,
+    GroupConfig.token_address,
+    GroupConfig.symbol,
+    GroupConfig.emoji,
+    GroupConfig.min_buy,
+    GroupConfig.buy_step,
+    GroupConfig.telegram_link,
+    GroupConfig.website_link,
+    GroupConfig.twitter_link,
+    GroupConfig.custom_media
+)
+
+# The EXISTS column piggybacks the boost check on the same round-trip,
+# so a cache miss costs one query instead of two
+GROUP_CONFIG_SQL = text(
+    "SELECT group_id, token_address, symbol, emoji, min_buy, buy_step, "
+    "telegram_link, website_link, twitter_link, custom_media, "
+    "EXISTS("
+    "    SELECT 1 FROM boosts b"
+    "    WHERE b.token_address = :token"
+    "    AND b.start_time + (b.duration_hours || ' hours')::interval > NOW()"
+    ") AS is_boosted "
+    "FROM group_configs "
+    "WHERE token_address = :token AND is_active = true"
+)
+
+# Wall-clock cache: datetime.utcnow() pays a syscall per call, so the
+# per-event hot path reads a value refreshed once a second instead.
+# Anything needing sub-second precision should still call utcnow().
+_cached_utcnow = datetime.utcnow()
+
+def utcnow_cached() -> datetime:
+    """Current UTC time, accurate to about one second"""
+    return _cached_utcnow
+
+async def refresh_clock():
+    """Refresh the cached wall-clock time every second"""
+    global _cached_utcnow
+    while True:
+        _cached_utcnow = datetime.utcnow()
+        await asyncio.sleep(1)
+
+# Boost pricing and durations: immutable (key, duration hours, price
+# SUI, display) rows, with a derived dict for O(1) callback lookups
+BOOST_OPTIONS = (
+    ("4h", 4, 15, "4 Hours - 15 SUI"),
+    ("8h", 8, 20, "8 Hours - 20 SUI"),
+    ("12h", 12, 27, "12 Hours - 27 SUI"),
+    ("24h", 24, 45, "24 Hours - 45 SUI"),
+    ("48h", 48, 80, "48 Hours - 80 SUI"),
+    ("72h", 72, 110, "72 Hours - 110 SUI"),
+    ("1w", 168, 180, "1 Week - 180 SUI")
+)
+BOOST_OPTIONS_BY_KEY = {
+    key: {"duration": duration, "price": price, "display": display}
+    for key, duration, price, display in BOOST_OPTIONS
 }
 
+# The bot's own username never changes while running; fetch it once
+# instead of a getMe round-trip on every /start and /boost
+_bot_username: Optional[str] = None
+
+async def get_bot_username() -> str:
+    """Return the bot's username, fetched once and cached"""
+    global _bot_username
+    if _bot_username is None:
+        _bot_username = (await bot.me()).username
+    return _bot_username
+
 class BuyBotException(Exception):
     """Custom exception for bot-specific errors"""
     pass
 
 async def validate_token_address(address: str) -> bool:
     """Validate Sui token address format and existence"""
-    if not re.match(r'^0x[a-fA-F0-9]{64}$', address):
+    if not TOKEN_ADDRESS_RE.match(address):
         return False
     try:
         return await SuiAPI.token_exists(address)
@@ -120,82 +253,140 @@ def create_config_keyboard(current_config: Optional[Config] = None) -> InlineKey
     builder.adjust(2, 2, 2, 2, 2)
     return builder.as_markup()
 
-def create_boost_keyboard() -> InlineKeyboardMarkup:
-    """Create boost options keyboard"""
+def _build_boost_keyboard() -> InlineKeyboardMarkup:
+    """Build the boost options keyboard from BOOST_OPTIONS"""
     builder = InlineKeyboardBuilder()
-    
-    for key, data in BOOST_OPTIONS.items():
+
+    for key, _duration, _price, display in BOOST_OPTIONS:
         builder.button(
-            text=data["display"],
+            text=display,
             callback_data=f"boost_{key}"
         )
-    
+
     builder.button(text="❌ Cancel Boost", callback_data="boost_cancel")
     builder.adjust(1)
     return builder.as_markup()
 
+# BOOST_OPTIONS is immutable, so the keyboard is built once at import
+# instead of per interaction
+BOOST_KEYBOARD = _build_boost_keyboard()
+
+def create_boost_keyboard() -> InlineKeyboardMarkup:
+    """Return the precomputed boost options keyboard"""
+    return BOOST_KEYBOARD
+
+# Fixed alert body scanned in one C-level format_map pass; the keys
+# line up with render_common_fragments plus the per-group derived values
+ALERT_TEMPLATE = (
+    "<b>{symbol} Buy!</b>\n\n"
+    "{emoji_line}\n"
+    "{size}\n"
+    "➡️ Got {token_amount} {symbol}\n\n"
+    "{buyer}\n"
+    "{mcap}\n"
+    "{liquidity}\n"
+    "{price}\n"
+    "{sui_price}\n"
+    "{footer}"
+)
+
+def render_common_fragments(buy_data: BuyData) -> Dict[str, str]:
+    """Render the per-buy alert fragments shared by every group"""
+    wallet = f"{buy_data.buyer_address[:4]}...{buy_data.buyer_address[-4:]}"
+    return {
+        "size": f"⬅️ Size ${buy_data.amount_usd:,.2f} | {buy_data.amount_sui:.2f} SUI",
+        "token_amount": f"{buy_data.token_amount:,.2f}",
+        "buyer": f"👤 <a href='{buy_data.buyer_url}'>{wallet}</a> | <a href='{buy_data.tx_url}'>Txn</a>",
+        "mcap": f"🔼 MCap ${buy_data.mcap:,.2f}",
+        "liquidity": f"📊 TVL/Liq ${buy_data.liquidity:,.2f}",
+        "price": f"📊 Price ${buy_data.price:.8f}",
+        "sui_price": f"💧 SUI Price: ${buy_data.sui_price:.2f}\n"
+    }
+
 async def format_buy_alert(
     buy_data: BuyData,
     token_config: GroupConfig,
-    is_trending: bool = False
+    is_trending: bool = False,
+    common: Optional[Dict[str, str]] = None
 ) -> tuple[str, InlineKeyboardMarkup]:
     """Format buy alert message with custom emojis and data"""
     try:
-        # Calculate emoji count based on buy_step
+        # Shared fragments are rendered once per buy and reused for
+        # every group tracking the token
+        if common is None:
+            common = render_common_fragments(buy_data)
+
+        # Calculate emoji count based on buy_step (float math; see
+        # config_thresholds)
+        buy_step = config_thresholds(token_config)[1]
         emoji_count = min(
-            int(Decimal(buy_data.amount_usd) / Decimal(token_config.buy_step)),
+            max(int(float(buy_data.amount_usd) / buy_step), 0),
             MAX_EMOJIS
         )
-        emojis = (token_config.emoji + " ") * emoji_count if emoji_count > 0 else ""
-        
-        # Format wallet address
-        wallet = f"{buy_data.buyer_address[:4]}...{buy_data.buyer_address[-4:]}"
-        
-        # Build message
-        message_parts = [
-            f"<b>{token_config.symbol} Buy!</b>\n",
-            f"\n{emojis}\n" if emojis else "\n",
-            f"⬅️ Size ${buy_data.amount_usd:,.2f} | {buy_data.amount_sui:.2f} SUI",
-            f"➡️ Got {buy_data.token_amount:,.2f} {token_config.symbol}\n",
-            f"👤 <a href='{buy_data.buyer_url}'>{wallet}</a> | <a href='{buy_data.tx_url}'>Txn</a>",
-            f"🔼 MCap ${buy_data.mcap:,.2f}",
-            f"📊 TVL/Liq ${buy_data.liquidity:,.2f}",
-            f"📊 Price ${buy_data.price:.8f}",
-            f"💧 SUI Price: ${buy_data.sui_price:.2f}\n"
-        ]
-
-        # Add configured links
-        links = []
-        if token_config.website_link:
-            links.append(f"<a href='{token_config.website_link}'>Website</a>")
-        if token_config.telegram_link:
-            links.append(f"<a href='{token_config.telegram_link}'>Telegram</a>")
-        if token_config.twitter_link:
-            links.append(f"<a href='{token_config.twitter_link}'>X</a>")
-        
-        if links:
-            message_parts.append(" | ".join(links) + "\n")
-        
-        # Add standard footer
-        message_parts.extend([
-            f"\n<a href='{buy_data.chart_url}'>Chart</a> | ",
-            f"<a href='https://t.me/suivolumebot'>Vol. Bot</a> | ",
-            f"<a href='https://t.me/SuiTrendingBullShark'>Sui Trending</a>\n",
-            "———\n",
-            "<a href='https://t.me/BullsharkTrendingBot?start=adBuyRequest'>",
-            "Ad: Place your advertisement here</a>"
-        ])
-        
-        message = "\n".join(message_parts)
-        
-        # Create buy button
-        keyboard = InlineKeyboardMarkup(inline_keyboard=[[
-            InlineKeyboardButton(
-                text="🛍 Buy Now",
-                url=buy_data.buy_url
+        emoji = token_config.emoji
+        lines = emoji_line_cache.get(emoji)
+        if lines is None:
+            lines = ("\n",) + tuple(
+                f"\n{(emoji + ' ') * n}\n" for n in range(1, MAX_EMOJIS + 1)
             )
-        ]])
+            emoji_line_cache[emoji] = lines
+        emoji_line = lines[emoji_count]
+
+        # Links and footer are static per config, so render them once and
+        # reuse the cached tail for every subsequent buy
+        footer_key = (
+            buy_data.token_address,
+            token_config.website_link,
+            token_config.telegram_link,
+            token_config.twitter_link
+        )
+        footer = alert_footer_cache.get(footer_key)
+        if footer is None:
+            footer_parts = []
+
+            links = []
+            if token_config.website_link:
+                links.append(f"<a href='{token_config.website_link}'>Website</a>")
+            if token_config.telegram_link:
+                links.append(f"<a href='{token_config.telegram_link}'>Telegram</a>")
+            if token_config.twitter_link:
+                links.append(f"<a href='{token_config.twitter_link}'>X</a>")
+
+            if links:
+                footer_parts.append(" | ".join(links) + "\n")
+
+            footer_parts.extend([
+                f"\n<a href='{buy_data.chart_url}'>Chart</a> | ",
+                f"<a href='https://t.me/suivolumebot'>Vol. Bot</a> | ",
+                f"<a href='https://t.me/SuiTrendingBullShark'>Sui Trending</a>\n",
+                "———\n",
+                "<a href='https://t.me/BullsharkTrendingBot?start=adBuyRequest'>",
+                "Ad: Place your advertisement here</a>"
+            ])
+
+            footer = "\n".join(footer_parts)
+            alert_footer_cache[footer_key] = footer
+
+        # Single-pass substitution into the constant template; output is
+        # identical to the old inline f-string
+        message = ALERT_TEMPLATE.format_map({
+            **common,
+            "symbol": token_config.symbol,
+            "emoji_line": emoji_line,
+            "footer": footer
+        })
         
+        # Create buy button (cached per token)
+        keyboard = buy_keyboard_cache.get(buy_data.token_address)
+        if keyboard is None:
+            keyboard = InlineKeyboardMarkup(inline_keyboard=[[
+                InlineKeyboardButton(
+                    text="🛍 Buy Now",
+                    url=buy_data.buy_url
+                )
+            ]])
+            buy_keyboard_cache[buy_data.token_address] = keyboard
+
         return message, keyboard
         
     except Exception as e:
@@ -236,14 +427,14 @@ async def cmd_start(message: types.Message):
                 reply_markup=InlineKeyboardMarkup(inline_keyboard=[[
                     InlineKeyboardButton(
                         text="🔧 Configure Bot",
-                        url=f"https://t.me/{(await bot.me()).username}?start=config_{message.chat.id}"
+                        url=f"https://t.me/{await get_bot_username()}?start=config_{message.chat.id}"
                     )
                 ]])
             )
         else:
             await message.answer("⚠️ Only group administrators can configure the bot.")
 
-@dp.message(Command("boost"))
+@boost_router.message(Command("boost"))
 async def cmd_boost(message: types.Message):
     """Handle /boost command"""
     if message.chat.type != "private":
@@ -252,7 +443,7 @@ async def cmd_boost(message: types.Message):
             reply_markup=InlineKeyboardMarkup(inline_keyboard=[[
                 InlineKeyboardButton(
                     text="🚀 Boost Token",
-                    url=f"https://t.me/{(await bot.me()).username}?start=boost"
+                    url=f"https://t.me/{await get_bot_username()}?start=boost"
                 )
             ]])
         )
@@ -269,7 +460,105 @@ async def cmd_boost(message: types.Message):
         "Example: 0x7b888393d6a552819bb0a7f878183abaf04550bfb9546b20ea586d338210826f"
     )
 
-@dp.callback_query(F.data.startswith("boost_"))
+# Config field table: one data-driven handler covers every config_*
+# button instead of a near-identical handler per field
+CONFIG_FIELDS = {
+    "config_token": (ConfigState.AWAITING_TOKEN, "Please enter the token contract address:"),
+    "config_emoji": (ConfigState.AWAITING_EMOJI, "Please send the emoji to use for buys:"),
+    "config_min_buy": (ConfigState.AWAITING_MIN_BUY, "Please enter the minimum buy amount in USD:"),
+    "config_buy_step": (ConfigState.AWAITING_BUY_STEP, "Please enter the buy step in USD (one emoji per step):"),
+    "config_telegram": (ConfigState.AWAITING_TELEGRAM, "Please send your Telegram link (or 'none' to remove):"),
+    "config_website": (ConfigState.AWAITING_WEBSITE, "Please send your website link (or 'none' to remove):"),
+    "config_twitter": (ConfigState.AWAITING_TWITTER, "Please send your Twitter/X link (or 'none' to remove):"),
+    "config_media": (ConfigState.AWAITING_MEDIA, "Please send the media to attach to buy alerts:")
+}
+
+@config_router.callback_query(F.data.in_(CONFIG_FIELDS))
+async def handle_config_field(callback: CallbackQuery):
+    """Prompt for the selected configuration field"""
+    config = config_sessions.get(callback.from_user.id)
+    if not config:
+        await callback.answer("Please restart configuration with /start")
+        return
+
+    state, prompt = CONFIG_FIELDS[callback.data]
+    config.state = state
+    await callback.message.answer(prompt)
+    await callback.answer()
+
+@config_router.message(F.chat.type == "private", F.text, ~F.text.startswith("/"))
+async def handle_config_input(message: Message):
+    """Route free-text input to the active configuration session"""
+    if message.from_user.id in boost_sessions:
+        return
+
+    config = config_sessions.get(message.from_user.id)
+    if not config or config.state == ConfigState.IDLE:
+        return
+
+    success, reply = await config.handle_input(message.text)
+    if success:
+        config.state = ConfigState.IDLE
+        await message.answer(reply, reply_markup=create_config_keyboard(config))
+    else:
+        await message.answer(reply)
+
+@config_router.callback_query(F.data == "config_save")
+async def handle_config_save(callback: CallbackQuery):
+    """Persist the configuration session to the database"""
+    user_id = callback.from_user.id
+    config = config_sessions.get(user_id)
+
+    if not config:
+        await callback.answer("Please restart configuration with /start")
+        return
+    if not config.token_address:
+        await callback.answer("Please set a token address first", show_alert=True)
+        return
+
+    # Read everything out of the session before touching the database so
+    # the connection is held only for the write itself
+    values = config.to_dict()
+    values["symbol"] = values.pop("token_symbol") or ""
+    # to_dict stringifies amounts for JSON storage; the Numeric columns
+    # want the Decimals back
+    values["min_buy"] = config.min_buy
+    values["buy_step"] = config.buy_step
+
+    try:
+        async with get_session() as db:
+            # Parent groups row first, in the same transaction, so the
+            # config FK on chat_id always has a row to point at
+            await db.execute(
+                pg_insert(Group)
+                .values(chat_id=values["group_id"])
+                .on_conflict_do_nothing(index_elements=[Group.chat_id])
+            )
+            # Single upsert instead of SELECT-then-branch
+            stmt = pg_insert(GroupConfig).values(**values).on_conflict_do_update(
+                index_elements=[GroupConfig.group_id, GroupConfig.token_address],
+                set_=values
+            )
+            await db.execute(stmt)
+            await db.commit()
+    except IntegrityError as e:
+        logger.error(f"Error saving config for group {values['group_id']}: {e}")
+        await callback.answer(
+            "Failed to save configuration, please try again.", show_alert=True
+        )
+        return
+
+    await refresh_config_cache(config.token_address)
+    del config_sessions[user_id]
+    await callback.message.edit_text("✅ Configuration saved!")
+
+@config_router.callback_query(F.data == "config_cancel")
+async def handle_config_cancel(callback: CallbackQuery):
+    """Discard the configuration session"""
+    config_sessions.pop(callback.from_user.id, None)
+    await callback.message.edit_text("Configuration cancelled.")
+
+@boost_router.callback_query(F.data.startswith("boost_"))
 async def handle_boost_callback(callback: CallbackQuery):
     """Handle boost duration selection"""
     user_id = callback.from_user.id
@@ -279,18 +568,23 @@ async def handle_boost_callback(callback: CallbackQuery):
         return
     
     if callback.data == "boost_cancel":
-        del boost_sessions[user_id]
+        session = boost_sessions.pop(user_id, None)
+        if session and "cancel_event" in session:
+            # Wake the payment monitor immediately instead of letting it
+            # poll out the rest of the window
+            session["cancel_event"].set()
         await callback.message.edit_text("Boost configuration cancelled.")
         return
     
     duration_key = callback.data.split("_")[1]
-    boost_data = BOOST_OPTIONS[duration_key]
+    boost_data = BOOST_OPTIONS_BY_KEY[duration_key]
     session = boost_sessions[user_id]
     
     session.update({
         "duration": boost_data["duration"],
         "price": boost_data["price"],
-        "step": "payment"
+        "step": "payment",
+        "cancel_event": asyncio.Event()
     })
     
     payment_instructions = (
@@ -318,9 +612,18 @@ async def monitor_boost_payment(user_id: int, session: dict):
     token_address = session["token"]
     expected_amount = session["price"]
     start_time = datetime.utcnow()
-    
+    cancel_event = session.get("cancel_event") or asyncio.Event()
+
+    # Wall time is only for the payment-lookup API; the loop deadline is
+    # monotonic so clock adjustments can't stretch or cut the window
+    deadline = time.monotonic() + 30 * 60
+
+    # Most payments land within the first minute or never: poll quickly
+    # at first, then back off instead of hammering the RPC every 10s
+    poll_interval = 2
+
     try:
-        while (datetime.utcnow() - start_time) < timedelta(minutes=30):
+        while time.monotonic() < deadline:
             if await SuiAPI.verify_payment(
                 BOOST_WALLET,
                 expected_amount,
@@ -338,34 +641,47 @@ async def monitor_boost_payment(user_id: int, session: dict):
                     db.add(boost)
                     await db.commit()
                 
-                # Update token cache
-                if token_address in token_cache:
-                    token_cache[token_address].is_boosted = True
+                # Invalidate cached token state so the next read
+                # repopulates with the boost flag set authoritatively
+                token_cache.pop(token_address, None)
+                SuiAPI.invalidate_token(token_address)
+                boost_status_cache.pop(token_address, None)
                 
-                # Notify user
-                await bot.send_message(
-                    user_id,
-                    f"✅ Boost payment confirmed!\n\n"
-                    f"Your token will be boosted for {session['duration']} hours.\n"
-                    f"All buys will be shown in @moonbagstrending during this period!"
-                )
-                
-                # Notify trending channel
+                # Notify user and trending channel concurrently - the two
+                # sends are independent, so don't pay them back to back
                 token_data = await SuiAPI.get_token_data(token_address)
-                await bot.send_message(
-                    TRENDING_CHANNEL,
-                    f"🚀 New Token Boost!\n\n"
-                    f"${token_data.symbol} ({token_data.name})\n"
-                    f"Duration: {session['duration']} hours\n"
-                    f"Contract: <code>{token_address}</code>\n\n"
-                    f"All buys will be displayed here during the boost period! 🔥"
+                results = await asyncio.gather(
+                    bot.send_message(
+                        user_id,
+                        f"✅ Boost payment confirmed!\n\n"
+                        f"Your token will be boosted for {session['duration']} hours.\n"
+                        f"All buys will be shown in @moonbagstrending during this period!"
+                    ),
+                    bot.send_message(
+                        TRENDING_CHANNEL,
+                        f"🚀 New Token Boost!\n\n"
+                        f"${token_data.symbol} ({token_data.name})\n"
+                        f"Duration: {session['duration']} hours\n"
+                        f"Contract: <code>{token_address}</code>\n\n"
+                        f"All buys will be displayed here during the boost period! 🔥"
+                    ),
+                    return_exceptions=True
                 )
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error(f"Error sending boost notification: {result}")
                 
                 del boost_sessions[user_id]
                 return
-            
-            await asyncio.sleep(10)
-        
+
+            try:
+                await asyncio.wait_for(cancel_event.wait(), timeout=poll_interval)
+                # User cancelled the payment; stop monitoring quietly
+                return
+            except asyncio.TimeoutError:
+                pass
+            poll_interval = min(poll_interval * 2, 30)
+
         # Payment timeout
         await bot.send_message(
             user_id,
@@ -381,114 +697,358 @@ async def monitor_boost_payment(user_id: int, session: dict):
         if user_id in boost_sessions:
             del boost_sessions[user_id]
 
+async def load_config_cache():
+    """Load all group configurations into the in-memory cache"""
+    # Stream in server-side batches rather than materializing the whole
+    # table twice (once as rows, once as the grouped dict)
+    grouped: Dict[str, List[GroupConfig]] = {}
+    count = 0
+
+    async with get_session() as db:
+        result = await db.stream(
+            select(GroupConfig)
+            .where(GroupConfig.is_active == True)
+            .options(load_only(*GROUP_CONFIG_COLUMNS))
+            .execution_options(yield_per=500)
+        )
+        async for config in result.scalars():
+            grouped.setdefault(config.token_address, []).append(config)
+            count += 1
+
+    async with config_cache_lock:
+        config_cache.clear()
+        config_cache.update(grouped)
+
+    logger.info(f"Loaded {count} group configs into cache")
+
+async def refresh_config_cache(token_address: str):
+    """Reload cached configurations for a single token after a save"""
+    async with get_session() as db:
+        result = await db.execute(
+            select(GroupConfig)
+            .where(
+                GroupConfig.token_address == token_address,
+                GroupConfig.is_active == True
+            )
+            .options(load_only(*GROUP_CONFIG_COLUMNS))
+        )
+        configs = result.scalars().all()
+
+    async with config_cache_lock:
+        if configs:
+            config_cache[token_address] = list(configs)
+        else:
+            config_cache.pop(token_address, None)
+
+    # Threshold floats may have changed with the config
+    for key in [k for k in config_float_cache if k[1] == token_address]:
+        del config_float_cache[key]
+
+@dp.my_chat_member()
+async def handle_bot_membership(update: ChatMemberUpdated):
+    """Evict cached configs when the bot is removed from a group"""
+    if update.new_chat_member.status not in ("left", "kicked"):
+        return
+
+    async with config_cache_lock:
+        for token_address, configs in list(config_cache.items()):
+            remaining = [c for c in configs if c.group_id != update.chat.id]
+            if len(remaining) == len(configs):
+                continue
+            if remaining:
+                config_cache[token_address] = remaining
+            else:
+                del config_cache[token_address]
+
+# Buy events are handed off from the WebSocket reader to a small worker
+# pool so slow processing (DB, formatting) never stalls the socket
+buy_event_queue: asyncio.Queue = asyncio.Queue(maxsize=5000)
+BUY_WORKERS = 4
+
+async def enqueue_buy_event(buy_data: BuyData):
+    """Hand a buy event from the WebSocket reader to the worker pool"""
+    try:
+        buy_event_queue.put_nowait(buy_data)
+    except asyncio.QueueFull:
+        logger.warning("Buy event queue full, dropping event")
+
+async def buy_event_worker():
+    """Process queued buy events"""
+    while True:
+        buy_data = await buy_event_queue.get()
+        try:
+            await process_buy_event(buy_data)
+        except Exception as e:
+            logger.error(f"Error in buy event worker: {e}")
+        finally:
+            buy_event_queue.task_done()
+
+# boost_router first: config_router carries the private free-text
+# catch-all, which must never get a look at updates before the command
+# handlers do
+dp.include_router(boost_router)
+dp.include_router(config_router)
+
 async def process_buy_event(buy_data: BuyData):
     """Process incoming buy events"""
     try:
-        # Get token configuration for all groups tracking this token
-        async with get_session() as db:
-            groups = await db.execute(
-                select(GroupConfig).where(
-                    GroupConfig.token_address == buy_data.token_address
+        # Resolve configs from the in-memory cache; fall back to the DB
+        # only if the token has never been seen (e.g. cache not yet warm)
+        configs = config_cache.get(buy_data.token_address)
+        if configs is None:
+            async with get_session() as db:
+                groups = await db.execute(
+                    GROUP_CONFIG_SQL,
+                    {"token": buy_data.token_address}
+                )
+                configs = groups.all()
+            async with config_cache_lock:
+                config_cache[buy_data.token_address] = list(configs)
+            if configs:
+                # Seed the boost cache from the fused EXISTS column so
+                # check_token_boost below skips its own query
+                boost_status_cache.set(
+                    buy_data.token_address, bool(configs[0].is_boosted)
                 )
-            )
-            configs = groups.scalars().all()
         
+        # Queue the event for the periodic batched flush instead of
+        # committing once per buy
+        async with pending_writes_lock:
+            pending_buy_events.append({
+                "token_address": buy_data.token_address,
+                "buyer_address": buy_data.buyer_address,
+                "amount_sui": buy_data.amount_sui,
+                "amount_usd": buy_data.amount_usd,
+                "token_amount": buy_data.token_amount,
+                "price": buy_data.price,
+                "tx_hash": buy_data.tx_hash,
+                "timestamp": buy_data.timestamp
+            })
+            stats = pending_stats.setdefault(buy_data.token_address, {
+                "volume_delta": Decimal("0")
+            })
+            stats["price"] = buy_data.price
+            stats["mcap"] = buy_data.mcap
+            stats["liquidity"] = buy_data.liquidity
+            stats["volume_delta"] += buy_data.amount_usd
+
         # Check if token is boosted
         is_boosted = await check_token_boost(buy_data.token_address)
         
-        # Process for each configured group
-        for config in configs:
-            if Decimal(buy_data.amount_usd) >= Decimal(config.min_buy):
-                message, keyboard = await format_buy_alert(buy_data, config)
-                
-                try:
-                    await bot.send_message(
-                        config.group_id,
-                        message,
-                        reply_markup=keyboard
-                    )
-                except TelegramAPIError as e:
-                    logger.error(f"Failed to send alert to group {config.group_id}: {e}")
+        # Fan out to all configured groups concurrently; per-chat ordering
+        # is preserved because sends drain through the single alert queue
+        common = render_common_fragments(buy_data)
+        amount_usd = float(buy_data.amount_usd)
+
+        async def dispatch(config):
+            if amount_usd >= config_thresholds(config)[0]:
+                message, keyboard = await format_buy_alert(
+                    buy_data, config, common=common
+                )
+                await alert_queue.put((config.group_id, message, keyboard))
+
+        results = await asyncio.gather(
+            *(dispatch(config) for config in configs),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error dispatching buy alert: {result}")
         
         # Send to trending channel if meets criteria
         if (
-            Decimal(buy_data.amount_usd) >= MIN_TRENDING_BUY
+            amount_usd >= MIN_TRENDING_BUY
             or is_boosted
         ):
             trending_message, trending_keyboard = await format_buy_alert(
                 buy_data,
                 configs[0],  # Use first config for formatting
-                is_trending=True
+                is_trending=True,
+                common=common
             )
             
-            await bot.send_message(
-                TRENDING_CHANNEL,
-                trending_message,
-                reply_markup=trending_keyboard
+            await alert_queue.put(
+                (TRENDING_CHANNEL, trending_message, trending_keyboard)
             )
     
     except Exception as e:
         logger.error(f"Error processing buy event: {e}")
 
+async def alert_worker():
+    """Drain the alert queue, pacing sends to the Telegram rate limit"""
+    min_interval = 1 / MAX_SENDS_PER_SECOND
+    last_send = 0.0
+
+    while True:
+        chat_id, message, keyboard = await alert_queue.get()
+        try:
+            for attempt in range(MAX_SEND_RETRIES):
+                wait = min_interval - (time.monotonic() - last_send)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+
+                try:
+                    await bot.send_message(chat_id, message, reply_markup=keyboard)
+                    last_send = time.monotonic()
+                    break
+                except TelegramRetryAfter as e:
+                    # Flood wait: honour Telegram's requested delay, then retry
+                    logger.warning(
+                        f"Flood wait of {e.retry_after}s sending to {chat_id}"
+                    )
+                    await asyncio.sleep(e.retry_after)
+                except TelegramNetworkError as e:
+                    # Transient network failure: exponential backoff
+                    logger.warning(
+                        f"Network error sending to {chat_id} "
+                        f"(attempt {attempt + 1}): {e}"
+                    )
+                    await asyncio.sleep(0.5 * 2 ** attempt)
+                except TelegramAPIError as e:
+                    # Permanent API error (bad chat, blocked, ...): drop it
+                    logger.error(f"Failed to send alert to {chat_id}: {e}")
+                    break
+            else:
+                logger.error(
+                    f"Dropping alert for {chat_id} after "
+                    f"{MAX_SEND_RETRIES} attempts"
+                )
+        except Exception as e:
+            logger.error(f"Error in alert worker: {e}")
+        finally:
+            alert_queue.task_done()
+
+async def flush_pending_writes():
+    """Flush batched buy events and token stat deltas every few seconds"""
+    while True:
+        await asyncio.sleep(FLUSH_INTERVAL)
+
+        async with pending_writes_lock:
+            if not pending_buy_events and not pending_stats:
+                continue
+            events = list(pending_buy_events)
+            stats = dict(pending_stats)
+            pending_buy_events.clear()
+            pending_stats.clear()
+
+        try:
+            await flush_buy_events(events, stats)
+        except Exception as e:
+            logger.error(f"Error flushing buy event batch: {e}")
+
+# Leaderboard layout as constants: rows render through one format call
+# each and concatenate with a single join instead of quadratic +=
+LEADERBOARD_HEADER = (
+    "🏆 Sui Trending Tokens\n"
+    "Last 30 Minutes\n\n"
+)
+LEADERBOARD_ROW = (
+    "{i}. <a href='{telegram_link}'>${symbol}</a>\n"
+    "💰 MCap: ${mcap:,.0f}\n"
+    "📊 {change_symbol} {price_change:.2f}%\n\n"
+)
+
 async def update_leaderboard():
     """Update trending leaderboard every 30 minutes"""
+    last_hash = None
+    pinned_message_id = None
+
     while True:
         try:
             # Get top tokens by volume including boost effects
             top_tokens = await SuiAPI.get_trending_tokens()
-            
-            message = (
-                "🏆 Sui Trending Tokens\n"
-                "Last 30 Minutes\n\n"
-            )
-            
-            for i, token in enumerate(top_tokens[:10], 1):
-                price_change = token.price_change_30m
-                change_symbol = "🟢" if price_change >= 0 else "🔴"
-                
-                message += (
-                    f"{i}. <a href='{token.telegram_link}'>${token.symbol}</a>\n"
-                    f"💰 MCap: ${token.mcap:,.0f}\n"
-                    f"📊 {change_symbol} {abs(price_change):.2f}%\n\n"
+
+            row = LEADERBOARD_ROW.format
+            message = LEADERBOARD_HEADER + "".join(
+                row(
+                    i=i,
+                    telegram_link=token.telegram_link,
+                    symbol=token.symbol,
+                    mcap=token.mcap,
+                    change_symbol="🟢" if token.price_change_30m >= 0 else "🔴",
+                    price_change=abs(token.price_change_30m)
                 )
-            
-            # Send and pin in trending channel
-            sent = await bot.send_message(TRENDING_CHANNEL, message)
-            
-            try:
-                # Unpin previous message if exists
-                await bot.unpin_all_chat_messages(TRENDING_CHANNEL)
-                # Pin new message
-                await bot.pin_chat_message(TRENDING_CHANNEL, sent.message_id)
-            except TelegramAPIError as e:
-                logger.error(f"Error managing pins: {e}")
-            
+                for i, token in enumerate(top_tokens[:10], 1)
+            )
+
+            # Skip the send/pin API calls entirely when nothing changed
+            digest = hashlib.blake2b(message.encode(), digest_size=8).digest()
+            if digest != last_hash:
+                edited = False
+                if pinned_message_id is not None:
+                    # Edit the existing pinned message in place: one API
+                    # call instead of send + unpin + pin
+                    try:
+                        await bot.edit_message_text(
+                            message,
+                            chat_id=TRENDING_CHANNEL,
+                            message_id=pinned_message_id
+                        )
+                        edited = True
+                    except TelegramAPIError as e:
+                        logger.warning(f"Could not edit pinned leaderboard: {e}")
+
+                if not edited:
+                    sent = await bot.send_message(TRENDING_CHANNEL, message)
+                    try:
+                        # Unpin previous message if exists
+                        await bot.unpin_all_chat_messages(TRENDING_CHANNEL)
+                        # Pin new message
+                        await bot.pin_chat_message(TRENDING_CHANNEL, sent.message_id)
+                    except TelegramAPIError as e:
+                        logger.error(f"Error managing pins: {e}")
+                    pinned_message_id = sent.message_id
+
+                last_hash = digest
+
         except Exception as e:
             logger.error(f"Error updating leaderboard: {e}")
-        
+
         await asyncio.sleep(1800)  # 30 minutes
 
+# Boost status TTL cache: boost state changes a few times a day at
+# most, so hot tokens can skip the SELECT between checks
+boost_status_cache = TTLCache(maxsize=2048, ttl=60)
+
 async def check_token_boost(token_address: str) -> bool:
-    """Check if token is currently boosted"""
+    """Check if token is currently boosted (cached with a short TTL)"""
+    cached = boost_status_cache.get(token_address)
+    if cached is not None:
+        return cached
+
     async with get_session() as db:
         boost = await db.execute(
             select(Boost)
             .where(
                 Boost.token_address == token_address,
-                Boost.start_time + timedelta(hours=Boost.duration_hours) > datetime.utcnow()
+                # Interval arithmetic must happen in SQL; the same shape
+                # as GROUP_CONFIG_SQL's boost EXISTS clause
+                Boost.start_time + func.make_interval(0, 0, 0, 0, Boost.duration_hours)
+                > utcnow_cached()
             )
             .order_by(Boost.start_time.desc())
         )
-        return bool(boost.scalar())
+        is_boosted = bool(boost.scalar())
+
+    boost_status_cache.set(token_address, is_boosted)
+    return is_boosted
 
 async def startup():
     """Startup tasks"""
     # Initialize database
     await init_db()
-    
+
+    # Warm the config cache before events start flowing
+    await load_config_cache()
+
     # Start background tasks
+    asyncio.create_task(refresh_clock())
+    asyncio.create_task(alert_worker())
+    asyncio.create_task(flush_pending_writes())
     asyncio.create_task(update_leaderboard())
-    asyncio.create_task(SuiAPI.start_buy_monitoring(process_buy_event))
+    for _ in range(BUY_WORKERS):
+        asyncio.create_task(buy_event_worker())
+    asyncio.create_task(SuiAPI.start_buy_monitoring(enqueue_buy_event))
     
     # Setup webhook for Render
     if os.environ.get("WEBHOOK_URL"):
@@ -502,6 +1062,8 @@ async def shutdown():
     """Shutdown tasks"""
     await bot.delete_webhook()
     await bot.session.close()
+    await SuiAPI.close()
+    await close_utils_session()
 
 def setup_web_app():
     """Setup web app for Render"""
@@ -511,7 +1073,9 @@ def setup_web_app():
     
     async def handle_webhook(request):
         if request.match_info.get("token") == BOT_TOKEN:
-            update = types.Update(**await request.json())
+            # ujson parses the update payload several times faster than
+            # the stdlib decoder
+            update = types.Update(**await request.json(loads=ujson.loads))
             await dp.feed_update(bot, update)
             return web.Response()
         return web.Response(status=403)
@@ -526,7 +1090,15 @@ def setup_web_app():
 
 if __name__ == "__main__":
     from aiohttp import web
-    
+
+    # uvloop speeds up the WS/HTTP-heavy event loop; fall back to the
+    # stdlib loop where it isn't available (e.g. local Windows dev)
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     # Setup web app
     app = setup_web_app()
     
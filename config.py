@@ -1,4 +1,6 @@
 import re
+import sys
+import unicodedata
 from enum import Enum, auto
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
@@ -6,6 +8,13 @@ from decimal import Decimal
 from datetime import datetime
 from sui_api import SuiAPI
 
+# Validation patterns, compiled once at import. The address pattern is
+# pure ASCII hex, so re.ASCII keeps the match byte-oriented.
+ADDRESS_RE = re.compile(r'^0x[a-fA-F0-9]{64}$', re.ASCII)
+TELEGRAM_RE = re.compile(r'^https?:\/\/(t\.me|telegram\.me)\/[a-zA-Z0-9_]{5,}$')
+WEBSITE_RE = re.compile(r'^https?:\/\/[\w\-\.]+\.[a-zA-Z]{2,}(?:\/[\w\-\._~:/?#\[\]@!\$&\'\(\)\*\+,;=]*)?$')
+TWITTER_RE = re.compile(r'^https?:\/\/(twitter\.com|x\.com)\/[a-zA-Z0-9_]{1,15}$')
+
 class ConfigState(Enum):
     """Configuration states for the setup flow"""
     IDLE = auto()
@@ -18,7 +27,7 @@ class ConfigState(Enum):
     AWAITING_TWITTER = auto()
     AWAITING_MEDIA = auto()
 
-@dataclass
+@dataclass(slots=True)
 class Config:
     """Configuration class for group settings"""
     group_id: int
@@ -39,16 +48,11 @@ class Config:
     # Custom media
     custom_media: Optional[Dict[str, str]] = None
     
-    # Validation patterns
-    TELEGRAM_PATTERN = r'^https?:\/\/(t\.me|telegram\.me)\/[a-zA-Z0-9_]{5,}$'
-    WEBSITE_PATTERN = r'^https?:\/\/[\w\-\.]+\.[a-zA-Z]{2,}(?:\/[\w\-\._~:/?#\[\]@!\$&\'\(\)\*\+,;=]*)?$'
-    TWITTER_PATTERN = r'^https?:\/\/(twitter\.com|x\.com)\/[a-zA-Z0-9_]{1,15}$'
-    
     async def validate_token(self, address: str) -> tuple[bool, str]:
         """Validate token address and fetch symbol"""
         try:
             # Check format
-            if not re.match(r'^0x[a-fA-F0-9]{64}$', address):
+            if not ADDRESS_RE.match(address):
                 return False, "Invalid token address format. Please provide a valid Sui token address."
             
             # Check if token exists and get data
@@ -56,8 +60,10 @@ class Config:
             if not token_data:
                 return False, "Token not found on Sui blockchain. Please check the address."
             
-            self.token_address = address
-            self.token_symbol = token_data.symbol
+            # Many sessions configure the same token; interning shares
+            # one string object across them
+            self.token_address = sys.intern(address)
+            self.token_symbol = sys.intern(token_data.symbol)
             return True, f"Token {token_data.symbol} ({token_data.name}) configured successfully!"
             
         except Exception as e:
@@ -69,11 +75,12 @@ class Config:
         emoji = emoji.strip()
         
         # Check if it's a single emoji
-        if len(emoji) > 2:  # Most emojis are 1-2 characters
+        if not emoji or len(emoji) > 2:  # Most emojis are 1-2 characters
             return False, "Please provide a single emoji."
-        
-        # Basic emoji validation (this is simplified)
-        if not any(ord(c) > 127 for c in emoji):
+
+        # Emoji codepoints fall in the symbol/private-use categories; a
+        # single category lookup replaces scanning codepoints
+        if unicodedata.category(emoji[0]) not in ("So", "Sk", "Sm", "Co"):
             return False, "Invalid emoji. Please provide a valid emoji character."
         
         self.emoji = emoji
@@ -122,17 +129,17 @@ class Config:
         
         # Validate format
         if link_type == "telegram":
-            if not re.match(self.TELEGRAM_PATTERN, link):
+            if not TELEGRAM_RE.match(link):
                 return False, "Invalid Telegram link. Please use format: https://t.me/username"
             self.telegram_link = link
         
         elif link_type == "website":
-            if not re.match(self.WEBSITE_PATTERN, link):
+            if not WEBSITE_RE.match(link):
                 return False, "Invalid website URL. Please provide a valid HTTP(S) URL."
             self.website_link = link
         
         elif link_type == "twitter":
-            if not re.match(self.TWITTER_PATTERN, link):
+            if not TWITTER_RE.match(link):
                 return False, "Invalid Twitter/X link. Please use format: https://twitter.com/username"
             self.twitter_link = link
         
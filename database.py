@@ -1,11 +1,12 @@
 import os
+from contextlib import asynccontextmanager
 from datetime import datetime
 from decimal import Decimal
 from typing import Optional, List
 from sqlalchemy import (
-    Column, Integer, String, DateTime, 
+    Column, Integer, BigInteger, String, DateTime,
     Boolean, Numeric, ForeignKey, Index,
-    create_engine, select, func, text
+    create_engine, select, insert, func, text
 )
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import (
@@ -14,7 +15,7 @@ from sqlalchemy.orm import (
     relationship,
     selectinload
 )
-from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 from sqlalchemy.sql import expression
 from dotenv import load_dotenv
 
@@ -30,7 +31,24 @@ if DATABASE_URL.startswith("postgresql://"):
     DATABASE_URL = DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
 
 # Create async engine
-engine = create_async_engine(DATABASE_URL, echo=False, pool_size=20, max_overflow=10)
+# Pool sized for buy-event bursts: LIFO checkout keeps the hot subset of
+# connections warm, and recycling guards against server-side idle kills.
+# Knobs are env-overridable so deployments can match their Postgres
+# max_connections without a code change.
+engine = create_async_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_size=int(os.environ.get("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", "40")),
+    pool_timeout=int(os.environ.get("DB_POOL_TIMEOUT", "10")),
+    pool_pre_ping=True,
+    pool_recycle=int(os.environ.get("DB_POOL_RECYCLE", "1800")),
+    pool_use_lifo=True,
+    # Fold up to 1000 rows into one multi-VALUES INSERT on executemany
+    # paths (default page size is 1000/num_columns-ish and can split a
+    # single flush into several statements)
+    insertmanyvalues_page_size=1000
+)
 AsyncSessionLocal = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 Base = declarative_base()
@@ -40,7 +58,8 @@ class Group(Base):
     __tablename__ = "groups"
     
     id = Column(Integer, primary_key=True)
-    chat_id = Column(Integer, unique=True, nullable=False)
+    # Telegram supergroup ids (-100xxxxxxxxxx) overflow a 32-bit int
+    chat_id = Column(BigInteger, unique=True, nullable=False)
     title = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -56,7 +75,9 @@ class GroupConfig(Base):
     __tablename__ = "group_configs"
     
     id = Column(Integer, primary_key=True)
-    group_id = Column(Integer, ForeignKey("groups.id", ondelete="CASCADE"), nullable=False)
+    # Holds the Telegram chat id (what alerts send to), so the FK points
+    # at groups.chat_id rather than the surrogate groups.id
+    group_id = Column(BigInteger, ForeignKey("groups.chat_id", ondelete="CASCADE"), nullable=False)
     token_address = Column(String, nullable=False)
     symbol = Column(String, nullable=False)
     emoji = Column(String, default="🌙")
@@ -98,7 +119,14 @@ class Token(Base):
     boosts = relationship("Boost", back_populates="token", cascade="all, delete-orphan")
     
     Index("idx_tokens_symbol", symbol)
-    Index("idx_tokens_volume", volume_30m.desc())
+    # Covering index for the trending query: ORDER BY volume_30m DESC
+    # LIMIT n can be answered with an index-only scan instead of sorting
+    # the whole table
+    Index(
+        "idx_tokens_volume",
+        volume_30m.desc(),
+        postgresql_include=["address", "symbol", "price", "mcap", "price_change_30m"]
+    )
 
 class Boost(Base):
     """Token boost records"""
@@ -138,29 +166,46 @@ class BuyEvent(Base):
     tx_hash = Column(String, nullable=False, unique=True)
     timestamp = Column(DateTime, default=datetime.utcnow)
     
-    Index("idx_buy_events_token", token_address)
-    Index("idx_buy_events_timestamp", timestamp.desc())
-    Index("idx_buy_events_amount", amount_usd.desc())
+    # The hot query is "recent buys for token X ordered by time": a
+    # composite index serves it with one range scan, where separate
+    # single-column indexes forced a bitmap-heap scan plus sort
+    Index("idx_buy_events_token_ts", token_address, timestamp.desc())
+    # Whale lookups only ever filter on large buys, so a partial index
+    # keeps the structure small and hot in cache
+    Index(
+        "idx_buy_events_big",
+        amount_usd.desc(),
+        postgresql_where=text("amount_usd > 100")
+    )
 
-async def get_session() -> AsyncSession:
-    """Get database session"""
+@asynccontextmanager
+async def get_session():
+    """Yield a database session scoped to the calling block"""
     async with AsyncSessionLocal() as session:
-        return session
+        yield session
 
 async def init_db():
     """Initialize database"""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
-async def get_active_boosts() -> List[Boost]:
-    """Get all active token boosts"""
+async def get_active_boosts():
+    """Stream all active token boosts.
+
+    Yields boosts in server-side batches instead of materializing the
+    whole set, so scanning callers overlap processing with the fetch and
+    peak memory stays flat. selectinload still batches the token loads
+    per yield_per window.
+    """
     async with get_session() as session:
-        result = await session.execute(
+        stream = await session.stream_scalars(
             select(Boost)
             .where(Boost.is_active == True)
             .options(selectinload(Boost.token))
+            .execution_options(yield_per=100)
         )
-        return result.scalars().all()
+        async for boost in stream:
+            yield boost
 
 async def get_token_stats(token_address: str) -> Optional[Token]:
     """Get token statistics"""
@@ -178,28 +223,39 @@ async def update_token_stats(
     volume_30m: Decimal,
     price_change_30m: Decimal
 ):
-    """Update token statistics"""
+    """Update token statistics, creating the row if it doesn't exist.
+
+    A plain UPDATE is a silent no-op for a token we haven't indexed yet;
+    ON CONFLICT collapses the insert-or-update into one atomic round-trip.
+    The constant statement shape keeps asyncpg's per-connection prepared-
+    statement cache warm across calls. Stub metadata on insert is filled
+    in by the next get_token_data refresh, matching flush_buy_events.
+    """
     async with get_session() as session:
-        await session.execute(
-            text("""
-                UPDATE tokens 
-                SET price = :price,
-                    mcap = :mcap,
-                    liquidity = :liquidity,
-                    volume_30m = :volume_30m,
-                    price_change_30m = :price_change_30m,
-                    last_updated = NOW()
-                WHERE address = :token_address
-            """),
-            {
-                "token_address": token_address,
+        stmt = pg_insert(Token).values(
+            address=token_address,
+            name="",
+            symbol="",
+            decimals=9,
+            total_supply=0,
+            price=price,
+            mcap=mcap,
+            liquidity=liquidity,
+            volume_30m=volume_30m,
+            price_change_30m=price_change_30m,
+            last_updated=datetime.utcnow()
+        ).on_conflict_do_update(
+            index_elements=[Token.address],
+            set_={
                 "price": price,
                 "mcap": mcap,
                 "liquidity": liquidity,
                 "volume_30m": volume_30m,
-                "price_change_30m": price_change_30m
+                "price_change_30m": price_change_30m,
+                "last_updated": datetime.utcnow()
             }
         )
+        await session.execute(stmt)
         await session.commit()
 
 async def get_group_configs(token_address: str) -> List[GroupConfig]:
@@ -215,18 +271,108 @@ async def get_group_configs(token_address: str) -> List[GroupConfig]:
         )
         return result.scalars().all()
 
-async def record_buy_event(buy_event: BuyEvent):
-    """Record a new buy event"""
+# Above this batch size the COPY protocol beats multi-row INSERT; below
+# it the extra raw-connection plumbing isn't worth it
+COPY_THRESHOLD = 50
+BUY_EVENT_COPY_COLUMNS = (
+    "token_address", "buyer_address", "amount_sui", "amount_usd",
+    "token_amount", "price", "tx_hash", "timestamp"
+)
+
+async def record_buy_event(values: dict) -> int:
+    """Record a single buy event, returning its id.
+
+    Core insert().returning() folds the insert and the id fetch into one
+    round-trip; session.add + commit would run a separate refresh SELECT.
+    Bursts should go through flush_buy_events instead.
+    """
     async with get_session() as session:
-        session.add(buy_event)
+        result = await session.execute(
+            insert(BuyEvent).values(**values).returning(BuyEvent.id)
+        )
         await session.commit()
+        return result.scalar_one()
+
+async def flush_buy_events(events: List[dict], stats_deltas: dict):
+    """Persist a batch of buy events and merged token stat deltas.
 
-async def get_trending_tokens(limit: int = 10) -> List[Token]:
-    """Get trending tokens by volume"""
+    Events arrive as plain column dicts so the insert takes SQLAlchemy's
+    executemany fast path instead of per-object ORM unit-of-work. Large
+    batches go through asyncpg's COPY protocol instead, which does the
+    lock/permission/type checks once per batch rather than per row. Event
+    inserts and stat upserts share one session and one commit, so each
+    flush pays a single fsync regardless of batch size.
+
+    The token upserts must run first: buy_events.token_address carries an
+    FK to tokens.address, and the stats deltas cover every token in the
+    batch, so upserting them guarantees the parent rows exist before the
+    events land.
+    """
+    async with get_session() as session:
+        for token_address, delta in stats_deltas.items():
+            # Atomic single-statement upsert: accumulates volume on existing
+            # rows and creates a stub row for tokens we haven't indexed yet
+            # (metadata is filled in by the next get_token_data refresh)
+            stmt = pg_insert(Token).values(
+                address=token_address,
+                name="",
+                symbol="",
+                decimals=9,
+                total_supply=0,
+                price=delta["price"],
+                mcap=delta["mcap"],
+                liquidity=delta["liquidity"],
+                volume_30m=delta["volume_delta"],
+                last_updated=datetime.utcnow()
+            ).on_conflict_do_update(
+                index_elements=[Token.address],
+                set_={
+                    "price": delta["price"],
+                    "mcap": delta["mcap"],
+                    "liquidity": delta["liquidity"],
+                    "volume_30m": Token.volume_30m + delta["volume_delta"],
+                    "last_updated": datetime.utcnow()
+                }
+            )
+            await session.execute(stmt)
+        if len(events) >= COPY_THRESHOLD:
+            conn = await session.connection()
+            raw = await conn.get_raw_connection()
+            await raw.driver_connection.copy_records_to_table(
+                "buy_events",
+                records=[tuple(e[c] for c in BUY_EVENT_COPY_COLUMNS) for e in events],
+                columns=BUY_EVENT_COPY_COLUMNS
+            )
+        elif events:
+            # Skip duplicate tx_hashes instead of letting one replayed
+            # event abort the whole batch (COPY has no such escape hatch,
+            # so dupes there still surface as an error)
+            await session.execute(
+                pg_insert(BuyEvent).on_conflict_do_nothing(
+                    index_elements=[BuyEvent.tx_hash]
+                ),
+                events
+            )
+        await session.commit()
+
+async def get_trending_tokens(limit: int = 10) -> List:
+    """Get trending tokens by volume.
+
+    Selects only the leaderboard columns so the query is answered from
+    the covering idx_tokens_volume index instead of dragging every wide
+    Numeric column off the heap.
+    """
     async with get_session() as session:
         result = await session.execute(
-            select(Token)
+            select(
+                Token.address,
+                Token.symbol,
+                Token.price,
+                Token.mcap,
+                Token.price_change_30m,
+                Token.volume_30m
+            )
             .order_by(Token.volume_30m.desc())
             .limit(limit)
         )
-        return result.scalars().all()
+        return result.all()
@@ -7,9 +7,11 @@ import aiohttp
 from decimal import Decimal
 from dataclasses import dataclass
 import json
+import ujson
 import websockets
 from websockets.exceptions import ConnectionClosed
 from dotenv import load_dotenv
+from utils import TTLCache
 
 # Load environment variables
 load_dotenv()
@@ -23,6 +25,15 @@ BLOCKEDEN_WSS = os.environ.get("BLOCKEDEN_WSS")
 BLOCKEDEN_RPC = os.environ.get("BLOCKEDEN_RPC")
 SUIVISION_API_KEY = os.environ.get("SUIVISION_API_KEY")
 
+# SUI has 9 decimals; building the divisor once avoids a Decimal
+# construction per event on the hot path
+SUI_SCALE = Decimal(10**9)
+
+def _decimal_loads(s):
+    """JSON loader that parses floats straight to Decimal, skipping the
+    float -> str -> Decimal round trip"""
+    return json.loads(s, parse_float=Decimal)
+
 @dataclass
 class TokenData:
     address: str
@@ -60,7 +71,19 @@ class BuyData:
 
 class SuiAPI:
     _instance = None
-    _token_cache: Dict[str, TokenData] = {}
+    # Token metadata changes slowly, so repeated buys on the same token
+    # skip the RPC round-trip for the cache TTL
+    _token_cache: TTLCache = TTLCache(maxsize=5000, ttl=300)
+    # In-flight fetches keyed by address: a burst of buys on one token
+    # collapses to a single HTTP request instead of a thundering herd
+    _inflight: Dict[str, asyncio.Future] = {}
+    # SUI/USD moves slowly relative to buy-event rate; a few seconds of
+    # staleness is fine and saves one RPC per event. The lock makes the
+    # refresh single-flight so concurrent misses don't stampede the API.
+    _sui_price_cache: TTLCache = TTLCache(maxsize=1, ttl=5)
+    _sui_price_lock: asyncio.Lock = asyncio.Lock()
+    # Divisors for token base units, keyed by decimals (tiny value space)
+    _scale_cache: Dict[int, Decimal] = {}
     _price_history: Dict[str, List[Dict[str, Any]]] = {}
     _ws_client = None
     _session = None
@@ -74,16 +97,50 @@ class SuiAPI:
 
     async def _init(self):
         """Initialize HTTP session"""
-        self._session = aiohttp.ClientSession()
+        await self.get_http_session()
+
+    @classmethod
+    async def get_http_session(cls) -> aiohttp.ClientSession:
+        """Shared HTTP session reused by all outbound calls.
+
+        A fresh ClientSession per request re-does DNS and the TLS
+        handshake; one keep-alive session amortizes both.
+        """
+        if cls._session is None or cls._session.closed:
+            cls._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300)
+            )
+        return cls._session
+
+    @classmethod
+    def invalidate_token(cls, address: str):
+        """Drop cached data for a token so the next read refetches"""
+        cls._token_cache.pop(address, None)
+
+    @classmethod
+    async def close(cls):
+        """Close the shared HTTP session"""
+        if cls._session and not cls._session.closed:
+            await cls._session.close()
 
     @classmethod
     async def start_buy_monitoring(cls, callback: Callable):
         """Start WebSocket connection to monitor buys"""
+        backoff = 1
         while True:
             try:
-                async with websockets.connect(BLOCKEDEN_WSS) as websocket:
+                # Ping/pong keepalive detects dead connections instead of
+                # waiting for a recv to fail; the bounded queue stops a
+                # stalled consumer from buffering frames without limit
+                async with websockets.connect(
+                    BLOCKEDEN_WSS,
+                    ping_interval=20,
+                    ping_timeout=20,
+                    max_queue=1024
+                ) as websocket:
                     logger.info("Connected to Sui WebSocket")
-                    
+                    backoff = 1
+
                     # Subscribe to swap events
                     await websocket.send(json.dumps({
                         "jsonrpc": "2.0",
@@ -99,7 +156,10 @@ class SuiAPI:
                     while True:
                         try:
                             msg = await websocket.recv()
-                            event = json.loads(msg)
+                            # Every WS frame goes through this parse;
+                            # ujson is the fast path already used for
+                            # webhook bodies
+                            event = ujson.loads(msg)
                             
                             if "params" in event:
                                 buy_data = await cls._process_swap_event(event["params"])
@@ -115,7 +175,11 @@ class SuiAPI:
 
             except Exception as e:
                 logger.error(f"WebSocket connection error: {e}")
-                await asyncio.sleep(5)
+
+            # Exponential backoff between reconnects so a provider outage
+            # doesn't turn into a tight handshake loop
+            await asyncio.sleep(backoff)
+            backoff = min(30, backoff * 2)
 
     @classmethod
     async def _process_swap_event(cls, event_data: dict) -> Optional[BuyData]:
@@ -135,10 +199,18 @@ class SuiAPI:
             if not token_data:
                 return None
             
-            # Calculate amounts
-            amount_sui = Decimal(event_data["amount_in"]["amount"]) / Decimal(10**9)  # SUI decimals
-            amount_usd = amount_sui * await cls.get_sui_price()
-            token_amount = Decimal(event_data["amount_out"]["amount"]) / Decimal(10**token_data.decimals)
+            # Calculate amounts; one price fetch serves the whole event.
+            # On-chain amounts are integer base units, so parse with int()
+            # and divide by precomputed scales — the only per-event Decimal
+            # work left is the two divisions and the USD multiply
+            sui_price = await cls.get_sui_price()
+            amount_sui = Decimal(int(event_data["amount_in"]["amount"])) / SUI_SCALE
+            amount_usd = amount_sui * sui_price
+            scale = cls._scale_cache.get(token_data.decimals)
+            if scale is None:
+                scale = Decimal(10**token_data.decimals)
+                cls._scale_cache[token_data.decimals] = scale
+            token_amount = Decimal(int(event_data["amount_out"]["amount"])) / scale
             
             return BuyData(
                 token_address=token_address,
@@ -149,7 +221,7 @@ class SuiAPI:
                 price=token_data.price,
                 mcap=token_data.mcap,
                 liquidity=token_data.liquidity,
-                sui_price=await cls.get_sui_price(),
+                sui_price=sui_price,
                 timestamp=datetime.utcnow(),
                 tx_hash=event_data["tx_digest"],
                 buyer_url=f"https://suivision.xyz/account/{event_data['sender']}",
@@ -164,43 +236,65 @@ class SuiAPI:
 
     @classmethod
     async def get_token_data(cls, address: str) -> Optional[TokenData]:
-        """Get token data with caching"""
+        """Get token data with caching and single-flight fetches"""
+        # Check cache first
+        cached = cls._token_cache.get(address)
+        if cached is not None:
+            return cached
+
+        # If another task is already fetching this token, wait for its
+        # result instead of issuing a duplicate request
+        inflight = cls._inflight.get(address)
+        if inflight is not None:
+            return await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        cls._inflight[address] = future
         try:
-            # Check cache first
-            if address in cls._token_cache:
-                cached = cls._token_cache[address]
-                if datetime.utcnow() - cached.timestamp < timedelta(minutes=5):
-                    return cached.data
-
-            # Fetch from API
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{BLOCKEDEN_RPC}/token/{address}",
-                    headers={"x-api-key": SUIVISION_API_KEY}
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        token = TokenData(
-                            address=address,
-                            name=data["name"],
-                            symbol=data["symbol"],
-                            decimals=data["decimals"],
-                            total_supply=Decimal(data["total_supply"]),
-                            price=Decimal(data["price"]),
-                            mcap=Decimal(data["market_cap"]),
-                            liquidity=Decimal(data["liquidity"]),
-                            volume_30m=Decimal(data["volume_30m"]),
-                            price_change_30m=Decimal(data["price_change_percentage_30m"])
-                        )
-                        
-                        # Cache the result
-                        cls._token_cache[address] = {
-                            "data": token,
-                            "timestamp": datetime.utcnow()
-                        }
-                        
-                        return token
-            
+            token = await cls._fetch_token_data(address)
+            future.set_result(token)
+            return token
+        except Exception as e:
+            future.set_result(None)
+            logger.error(f"Error fetching token data: {e}")
+            return None
+        finally:
+            # If the fetching task was cancelled the future is still
+            # pending; cancel it so waiters are released rather than
+            # left awaiting an entry no longer in the map
+            if not future.done():
+                future.cancel()
+            del cls._inflight[address]
+
+    @classmethod
+    async def _fetch_token_data(cls, address: str) -> Optional[TokenData]:
+        """Fetch token data from the API and populate the cache"""
+        try:
+            session = await cls.get_http_session()
+            async with session.get(
+                f"{BLOCKEDEN_RPC}/token/{address}",
+                headers={"x-api-key": SUIVISION_API_KEY}
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    token = TokenData(
+                        address=address,
+                        name=data["name"],
+                        symbol=data["symbol"],
+                        decimals=data["decimals"],
+                        total_supply=Decimal(data["total_supply"]),
+                        price=Decimal(data["price"]),
+                        mcap=Decimal(data["market_cap"]),
+                        liquidity=Decimal(data["liquidity"]),
+                        volume_30m=Decimal(data["volume_30m"]),
+                        price_change_30m=Decimal(data["price_change_percentage_30m"])
+                    )
+
+                    # Cache the result
+                    cls._token_cache.set(address, token)
+
+                    return token
+
             return None
         except Exception as e:
             logger.error(f"Error fetching token data: {e}")
@@ -211,27 +305,29 @@ class SuiAPI:
         """Get trending tokens sorted by volume and boost status"""
         try:
             # Fetch top 100 tokens by volume
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{BLOCKEDEN_RPC}/trending",
-                    headers={"x-api-key": SUIVISION_API_KEY}
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        tokens = []
-                        for token_data in data["tokens"]:
-                            token = await cls.get_token_data(token_data["address"])
-                            if token:
-                                tokens.append(token)
-                        
-                        # Sort by volume and boost status
-                        return sorted(
-                            tokens,
-                            key=lambda x: (x.is_boosted, x.volume_30m),
-                            reverse=True
-                        )
-            
+            session = await cls.get_http_session()
+            async with session.get(
+                f"{BLOCKEDEN_RPC}/trending",
+                headers={"x-api-key": SUIVISION_API_KEY}
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+
+                    # The trending payload only carries addresses, so the
+                    # per-token lookups are unavoidable — but fetching them
+                    # concurrently turns N round-trips into roughly one
+                    results = await asyncio.gather(*(
+                        cls.get_token_data(t["address"]) for t in data["tokens"]
+                    ))
+                    tokens = [token for token in results if token]
+
+                    # Sort by volume and boost status
+                    return sorted(
+                        tokens,
+                        key=lambda x: (x.is_boosted, x.volume_30m),
+                        reverse=True
+                    )
+
             return []
         except Exception as e:
             logger.error(f"Error fetching trending tokens: {e}")
@@ -241,23 +337,23 @@ class SuiAPI:
     async def verify_payment(cls, wallet: str, amount: Decimal, start_time: datetime) -> bool:
         """Verify SUI payment"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    f"{BLOCKEDEN_RPC}/account/{wallet}/transactions",
-                    params={"start_time": start_time.isoformat()},
-                    headers={"x-api-key": SUIVISION_API_KEY}
-                ) as response:
-                    if response.status == 200:
-                        txs = await response.json()
-                        
-                        for tx in txs:
-                            if (
-                                tx["kind"] == "Pay"
-                                and tx["status"] == "success"
-                                and Decimal(tx["amount"]) / Decimal(10**9) == amount
-                            ):
-                                return True
-            
+            session = await cls.get_http_session()
+            async with session.get(
+                f"{BLOCKEDEN_RPC}/account/{wallet}/transactions",
+                params={"start_time": start_time.isoformat()},
+                headers={"x-api-key": SUIVISION_API_KEY}
+            ) as response:
+                if response.status == 200:
+                    txs = await response.json()
+
+                    for tx in txs:
+                        if (
+                            tx["kind"] == "Pay"
+                            and tx["status"] == "success"
+                            and Decimal(tx["amount"]) / Decimal(10**9) == amount
+                        ):
+                            return True
+
             return False
         except Exception as e:
             logger.error(f"Error verifying payment: {e}")
@@ -265,21 +361,33 @@ class SuiAPI:
 
     @classmethod
     async def get_sui_price(cls) -> Decimal:
-        """Get current SUI price in USD"""
-        try:
-            async with aiohttp.ClientSession() as session:
+        """Get current SUI price in USD, cached for a few seconds"""
+        price = cls._sui_price_cache.get("sui")
+        if price is not None:
+            return price
+
+        async with cls._sui_price_lock:
+            # Another task may have refreshed while we waited on the lock
+            price = cls._sui_price_cache.get("sui")
+            if price is not None:
+                return price
+
+            try:
+                session = await cls.get_http_session()
                 async with session.get(
                     f"{BLOCKEDEN_RPC}/price/sui",
                     headers={"x-api-key": SUIVISION_API_KEY}
                 ) as response:
                     if response.status == 200:
-                        data = await response.json()
-                        return Decimal(str(data["price"]))
-            
-            return Decimal("0")
-        except Exception as e:
-            logger.error(f"Error fetching SUI price: {e}")
-            return Decimal("0")
+                        data = await response.json(loads=_decimal_loads)
+                        price = Decimal(data["price"])
+                        cls._sui_price_cache.set("sui", price)
+                        return price
+
+                return Decimal("0")
+            except Exception as e:
+                logger.error(f"Error fetching SUI price: {e}")
+                return Decimal("0")
 
     @classmethod
     async def token_exists(cls, address: str) -> bool:
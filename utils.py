@@ -1,9 +1,154 @@
-import re
+import asyncio
+import json
+from bisect import bisect_right
+from collections import OrderedDict
 from datetime import datetime, timezone
 from decimal import Decimal
+from functools import lru_cache
+from time import monotonic, time
 from typing import Optional, Dict, Any, Union
+import re
 import aiohttp
-from urllib.parse import urlparse
+
+def _decimal_loads(s):
+    """JSON loader that parses floats straight to Decimal.
+
+    Skips the float -> str -> Decimal round trip and keeps the server's
+    exact textual value.
+    """
+    return json.loads(s, parse_float=Decimal)
+
+# Anchored scheme-plus-host check: one C pass over the leading
+# characters, where urlparse built a full ParseResult per call
+_VALID_URL_RE = re.compile(r'\Ahttps?://[^\s/]+')
+
+class _KeepNumericTable(dict):
+    """Translate table that deletes every codepoint except digits and dot.
+
+    __missing__ maps unknown codepoints to None, so str.translate strips
+    currency symbols, commas and any other junk in one C pass instead of
+    running the regex engine per character.
+    """
+
+    def __missing__(self, key):
+        return None
+
+_NUMERIC_TABLE = _KeepNumericTable({ord(c): c for c in '0123456789.'})
+
+# Tier tables answered by bisect_right: one C-coded binary search
+# replaces the Python comparison cascades in format_duration and
+# calculate_boost_multiplier. Duration units pair a divisor with the
+# display suffix; boost multipliers carry the 1.5x base already folded in
+_DUR_THRESHOLDS = (24, 168)
+_DUR_UNITS = ((1, "h"), (24, "d"), (168, "w"))
+_BOOST_THRESHOLDS = (20, 27, 45, 80, 110, 180)
+_BOOST_MULTIPLIERS = (
+    Decimal("1.5"),    # 4 hours base tier
+    Decimal("1.80"),   # 8 hours:  1.5 * 1.2
+    Decimal("1.95"),   # 12 hours: 1.5 * 1.3
+    Decimal("2.25"),   # 24 hours: 1.5 * 1.5
+    Decimal("2.70"),   # 48 hours: 1.5 * 1.8
+    Decimal("3.00"),   # 72 hours: 1.5 * 2.0
+    Decimal("3.75"),   # 1 week:   1.5 * 2.5
+)
+
+class TTLCache:
+    """Bounded in-process cache with per-entry time-to-live.
+
+    Entries expire ttl seconds after they are set; when the cache is
+    full the oldest entry is evicted first.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if monotonic() > expires_at:
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key: Any, value: Any):
+        if key in self._data:
+            del self._data[key]
+        elif len(self._data) >= self.maxsize:
+            self._data.popitem(last=False)
+        self._data[key] = (monotonic() + self.ttl, value)
+
+    def pop(self, key: Any, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        return entry[1] if entry is not None else default
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+# Shared HTTP session for the CoinGecko fallback: a per-call
+# ClientSession rebuilds the connector and TLS context and forfeits
+# keepalive. Created lazily on first use, closed via close_session()
+_SESSION: Optional[aiohttp.ClientSession] = None
+_session_lock = asyncio.Lock()
+# CoinGecko prices don't move intra-second; a short TTL collapses
+# concurrent alert formatters into one network call
+_sui_price_cache = TTLCache(maxsize=1, ttl=15)
+
+async def _get_session() -> aiohttp.ClientSession:
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        async with _session_lock:
+            if _SESSION is None or _SESSION.closed:
+                _SESSION = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+                )
+    return _SESSION
+
+async def close_session():
+    """Close the shared HTTP session (call from the shutdown hook)"""
+    if _SESSION and not _SESSION.closed:
+        await _SESSION.close()
+
+# Alert and leaderboard rendering format the same mcap/volume values
+# over and over between refreshes; the formatters are pure, so repeat
+# values come straight out of the memo instead of re-running the
+# f-string machinery
+@lru_cache(maxsize=4096)
+def _format_amount_cached(amount, decimals: int) -> str:
+    # K/M display keeps two decimals, so a double's ~15 significant
+    # digits lose nothing and float.__format__ is far cheaper than
+    # Decimal's. The sub-1000 tail stays Decimal because cents matter.
+    if isinstance(amount, Decimal) and amount >= 1_000:
+        amount = float(amount)
+    if amount >= 1_000_000:
+        return f"${amount / 1_000_000:,.2f}M"
+    elif amount >= 1_000:
+        return f"${amount / 1_000:,.2f}K"
+    else:
+        return f"${amount:,.{decimals}f}"
+
+# Burst buys come from the same few wallets; caching hands back the
+# existing string instead of two slice allocations plus a concat
+@lru_cache(maxsize=2048)
+def _shorten_address_cached(address: str, chars: int) -> str:
+    return f"{address[:chars]}...{address[-chars:]}"
+
+@lru_cache(maxsize=4096)
+def _format_large_number_cached(number: float) -> str:
+    if number >= 1_000_000_000:
+        return f"{number / 1_000_000_000:.1f}B"
+    elif number >= 1_000_000:
+        return f"{number / 1_000_000:.1f}M"
+    elif number >= 1_000:
+        return f"{number / 1_000:.1f}K"
+    else:
+        return f"{number:.1f}"
 
 class Utils:
     @staticmethod
@@ -12,30 +157,16 @@ class Utils:
         try:
             if isinstance(amount, str):
                 amount = Decimal(amount)
-            
-            if amount >= 1_000_000:
-                return f"${amount / 1_000_000:,.2f}M"
-            elif amount >= 1_000:
-                return f"${amount / 1_000:,.2f}K"
-            else:
-                return f"${amount:,.{decimals}f}"
-        except:
+            return _format_amount_cached(amount, decimals)
+        except (TypeError, ValueError, ArithmeticError):
             return "$0.00"
 
     @staticmethod
     def format_large_number(number: Union[Decimal, int, float]) -> str:
         """Format large numbers with K, M, B suffixes"""
         try:
-            number = float(number)
-            if number >= 1_000_000_000:
-                return f"{number / 1_000_000_000:.1f}B"
-            elif number >= 1_000_000:
-                return f"{number / 1_000_000:.1f}M"
-            elif number >= 1_000:
-                return f"{number / 1_000:.1f}K"
-            else:
-                return f"{number:.1f}"
-        except:
+            return _format_large_number_cached(float(number))
+        except (TypeError, ValueError, ArithmeticError):
             return "0"
 
     @staticmethod
@@ -48,7 +179,7 @@ class Utils:
                 return f"🔴 {change:.2f}%"
             else:
                 return "⚪ 0.00%"
-        except:
+        except (TypeError, ValueError, ArithmeticError):
             return "⚪ 0.00%"
 
     @staticmethod
@@ -56,32 +187,30 @@ class Utils:
         """Shorten blockchain address"""
         if not address:
             return ""
-        return f"{address[:chars]}...{address[-chars:]}"
+        return _shorten_address_cached(address, chars)
 
     @staticmethod
     def validate_url(url: str) -> bool:
         """Validate URL format"""
-        try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc])
-        except:
-            return False
+        return bool(url) and _VALID_URL_RE.match(url) is not None
 
     @staticmethod
     def is_valid_emoji(text: str) -> bool:
         """Check if string is a valid emoji"""
-        if not text:
+        if not text or len(text) > 2:
             return False
-        return len(text.encode('utf-16-le')) >= 4 and len(text) <= 2
+        # Same test as the old utf-16-le length check (>= 2 code units)
+        # without allocating a bytes object per call
+        return sum(2 if ord(c) > 0xFFFF else 1 for c in text) >= 2
 
     @staticmethod
     def parse_amount(amount_str: str) -> Optional[Decimal]:
         """Parse amount string to Decimal"""
         try:
             # Remove currency symbols and whitespace
-            cleaned = re.sub(r'[^\d.]', '', amount_str)
+            cleaned = amount_str.translate(_NUMERIC_TABLE)
             return Decimal(cleaned)
-        except:
+        except (TypeError, ValueError, ArithmeticError):
             return None
 
     @staticmethod
@@ -92,22 +221,15 @@ class Utils:
     @staticmethod
     def format_duration(hours: int) -> str:
         """Format duration in hours to human readable string"""
-        if hours >= 168:  # 1 week
-            weeks = hours // 168
-            return f"{weeks}w"
-        elif hours >= 24:
-            days = hours // 24
-            return f"{days}d"
-        else:
-            return f"{hours}h"
+        divisor, suffix = _DUR_UNITS[bisect_right(_DUR_THRESHOLDS, hours)]
+        return f"{hours // divisor}{suffix}"
 
     @staticmethod
     def format_timeago(dt: datetime) -> str:
         """Format datetime to time ago string"""
-        now = Utils.utc_now()
-        diff = now - dt
-        
-        seconds = diff.total_seconds()
+        # Plain float subtraction: avoids allocating a datetime and a
+        # timedelta per rendered timestamp
+        seconds = time() - dt.timestamp()
         if seconds < 60:
             return "just now"
         elif seconds < 3600:
@@ -124,44 +246,37 @@ class Utils:
 
     @staticmethod
     async def get_sui_price() -> Decimal:
-        """Get current SUI price from CoinGecko"""
+        """Get current SUI price from CoinGecko, cached for 15s"""
+        price = _sui_price_cache.get("sui")
+        if price is not None:
+            return price
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://api.coingecko.com/api/v3/simple/price",
-                    params={
-                        "ids": "sui",
-                        "vs_currencies": "usd"
-                    }
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return Decimal(str(data["sui"]["usd"]))
-        except:
+            session = await _get_session()
+            async with session.get(
+                "https://api.coingecko.com/api/v3/simple/price",
+                params={
+                    "ids": "sui",
+                    "vs_currencies": "usd"
+                },
+                # Bound slow responses so a stalled CoinGecko call can't
+                # hold up alert formatting
+                timeout=aiohttp.ClientTimeout(total=3)
+            ) as response:
+                if response.status == 200:
+                    data = await response.json(loads=_decimal_loads)
+                    price = Decimal(data["sui"]["usd"])
+                    _sui_price_cache.set("sui", price)
+                    return price
+        except (aiohttp.ClientError, asyncio.TimeoutError, KeyError, ValueError, ArithmeticError):
+            # Narrowed from a bare except so CancelledError and
+            # KeyboardInterrupt propagate instead of being swallowed
             pass
         return Decimal("0")
 
     @staticmethod
     def calculate_boost_multiplier(paid_amount: Decimal) -> Decimal:
         """Calculate boost multiplier based on paid amount"""
-        # Base multiplier is 1.5x
-        base_multiplier = Decimal("1.5")
-        
-        # Additional multiplier based on payment amount
-        if paid_amount >= 180:  # 1 week
-            return base_multiplier * Decimal("2.5")
-        elif paid_amount >= 110:  # 72 hours
-            return base_multiplier * Decimal("2.0")
-        elif paid_amount >= 80:  # 48 hours
-            return base_multiplier * Decimal("1.8")
-        elif paid_amount >= 45:  # 24 hours
-            return base_multiplier * Decimal("1.5")
-        elif paid_amount >= 27:  # 12 hours
-            return base_multiplier * Decimal("1.3")
-        elif paid_amount >= 20:  # 8 hours
-            return base_multiplier * Decimal("1.2")
-        else:  # 4 hours
-            return base_multiplier
+        return _BOOST_MULTIPLIERS[bisect_right(_BOOST_THRESHOLDS, paid_amount)]
 
     @staticmethod
     def generate_buy_link(token_address: str) -> str:
@@ -180,5 +295,5 @@ class Utils:
             if denominator == 0:
                 return Decimal("0")
             return numerator / denominator
-        except:
+        except (TypeError, ArithmeticError):
             return Decimal("0")